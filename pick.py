@@ -1,30 +1,111 @@
 import sys
 import csv
-import random
+import gc
+import io
+import atexit
 import os
-from collections import defaultdict
+from array import array
+from bisect import bisect, insort
+from collections import namedtuple
+from itertools import accumulate, chain, compress, repeat
+from operator import itemgetter
+from random import choices, random
 
 DATA_FILE = 'cards.csv'
 BAN_FILE = 'ban_status.csv'
+TEST_BATCH_SIZE = 100000  # 频率测试每批抽样次数, 限制内存占用
+
+CardRow = namedtuple('CardRow', 'name weight probability tags')
+
+def _format_tags(tags):
+    return ', '.join(sorted(tags)) if tags else '无'
 
 class CardManager:
     def __init__(self):
-        self.cards = []  # [{'name': str, 'weight': float, 'tags': set}]
-        self.ban_status = defaultdict(bool)  # {tag: bool}
-        self._load_data()
-        self._load_ban_status()
+        # 列式存储, 各列按下标一一对应
+        self.names = []  # [str]
+        self.weights = array('d')  # 连续存放的 double, 不再为每个权重装箱
+        self.tags = []  # [frozenset]
+        self._tags_str = []  # [str], 列表展示用的标签文本
+        self._name_to_idx = {}  # {name: idx}
+        self._tag_index = {}  # {tag: [idx]}, 下标升序
+        self.ban_status = {}  # {tag: bool}
+        self._banned_tags = set()  # ban_status 中为 True 的标签
+        # 抽卡用的累积权重缓存, 以 (_ban_version, _mutation_version) 为键, 任一变化即重建
+        self._mutation_version = 0
+        self._cdf_cache = None  # (key, names, cum_weights)
+        # 屏蔽状态缓存, 标签或屏蔽设置变化时递增 _ban_version 使其失效
+        self._ban_version = 0
+        self._banned_version = -1
+        self._banned = []  # [bool]
+        self._valid = []  # [bool]
+        # 总权重缓存, None 表示权重或屏蔽状态已变化, 下次读取时重新求和
+        self._total_weight = None
+        self._valid_total_weight = None
+        # 修改只标记为脏, 由 flush 统一写回 cards.csv
+        self._dirty = False
+        # 两个文件都在首次用到时才读取, 例如 --ban-tag 无需读 cards.csv
+        self._cards_loaded = False
+        self._bans_loaded = False
+        # 作为库使用时, 忘记调用 flush 的修改在退出时兜底写回;
+        # 注册会让该实例一直存活到进程退出. 命令行入口自行 flush 并注销此回调
+        atexit.register(self.flush)
+    
+    def _ensure_cards_loaded(self):
+        if not self._cards_loaded:
+            self._load_data()
+            self._cards_loaded = True
+    
+    def _ensure_bans_loaded(self):
+        if not self._bans_loaded:
+            self._load_ban_status()
+            self._bans_loaded = True
     
     def _load_data(self):
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) < 2:
-                        continue
-                    name = row[0]
-                    weight = float(row[1])
-                    tags = set(row[2:]) if len(row) > 2 else set()
-                    self.cards.append({'name': name, 'weight': weight, 'tags': tags})
+        if not os.path.exists(DATA_FILE):
+            return
+        
+        # 批量创建大量不含循环引用的小对象, 期间暂停 GC 免去反复的无效扫描
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(DATA_FILE, 'rb') as f:
+                data = f.read()
+            
+            if b'"' in data:
+                reader = csv.reader(io.StringIO(data.decode('utf-8'), newline=''))
+                to_str = str
+            else:
+                # 没有引号就没有转义, 直接在字节上按行、按逗号切分, 字段按需解码
+                reader = (line.split(b',') for line in data.splitlines())
+                to_str = bytes.decode
+            rows = [row for row in reader if len(row) >= 2]
+            
+            # 按列整体构建, 避免逐行调用 _append_card
+            self.names = [to_str(row[0]) for row in rows]
+            self.weights = array('d', [float(row[1]) for row in rows])
+            self._total_weight = sum(self.weights)
+            # 标签字符串驻留, 相同的标签组合共用同一个 frozenset
+            tag_sets = {}  # {key: (frozenset, 标签文本)}
+            self.tags = []
+            self._tags_str = []
+            for row in rows:
+                key = tuple(row[2:])
+                entry = tag_sets.get(key)
+                if entry is None:
+                    tags = frozenset(sys.intern(to_str(t)) for t in key)
+                    entry = tag_sets[key] = (tags, _format_tags(tags))
+                self.tags.append(entry[0])
+                self._tags_str.append(entry[1])
+            for i, tags in enumerate(self.tags):
+                for tag in tags:
+                    self._tag_index.setdefault(tag, []).append(i)
+            # 倒序写入, 同名卡牌保留首个出现的位置
+            self._name_to_idx = {self.names[i]: i for i in range(len(rows) - 1, -1, -1)}
+            self._ban_version += 1
+        finally:
+            if gc_enabled:
+                gc.enable()
     
     def _load_ban_status(self):
         if os.path.exists(BAN_FILE):
@@ -32,15 +113,50 @@ class CardManager:
                 reader = csv.reader(f)
                 for row in reader:
                     if len(row) >= 2:
-                        tag, status = row[0], row[1]
+                        tag, status = sys.intern(row[0]), row[1]
                         self.ban_status[tag] = (status == '1')
+        self._banned_tags = {tag for tag, banned in self.ban_status.items() if banned}
+        self._ban_version += 1
     
     def _save_data(self):
-        with open(DATA_FILE, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            for card in self.cards:
-                row = [card['name'], str(card['weight'])] + list(card['tags'])
-                writer.writerow(row)
+        rows = zip(self.names, self.weights, self.tags)
+        if self._needs_quoting():
+            buf = io.StringIO()
+            csv.writer(buf).writerows([name, str(weight), *tags] for name, weight, tags in rows)
+            text = buf.getvalue()
+        else:
+            # 没有需要转义的字段时直接拼接, 输出与 csv.writer 完全一致
+            text = ''.join(','.join((name, str(weight), *tags)) + '\r\n' for name, weight, tags in rows)
+        
+        # 整个文件一次写入临时文件再替换, 避免中途失败留下残缺的文件
+        tmp_file = DATA_FILE + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        os.replace(tmp_file, DATA_FILE)
+        self._dirty = False
+    
+    def _needs_quoting(self):
+        # _tag_index 的键覆盖了所有卡牌用到的标签
+        text = ''.join(chain(self.names, self._tag_index))
+        return any(ch in text for ch in ',"\r\n')
+    
+    def _append_data(self, row):
+        """新卡牌直接追加到文件末尾, 无需重写整个文件"""
+        missing_newline = False
+        if os.path.exists(DATA_FILE) and os.path.getsize(DATA_FILE) > 0:
+            with open(DATA_FILE, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                missing_newline = f.read(1) not in (b'\n', b'\r')
+        
+        with open(DATA_FILE, 'a', newline='', encoding='utf-8') as f:
+            if missing_newline:
+                f.write('\r\n')
+            csv.writer(f).writerow(row)
+    
+    def flush(self):
+        """把未保存的修改写回 cards.csv"""
+        if self._dirty:
+            self._save_data()
     
     def _save_ban_status(self):
         with open(BAN_FILE, 'w', newline='', encoding='utf-8') as f:
@@ -48,129 +164,186 @@ class CardManager:
             for tag, banned in self.ban_status.items():
                 writer.writerow([tag, '1' if banned else '0'])
     
+    def _append_card(self, name, weight, tags):
+        self._name_to_idx.setdefault(name, len(self.names))
+        self.names.append(name)
+        self.weights.append(weight)
+        self.tags.append(tags)
+        self._tags_str.append(_format_tags(tags))
+        self._total_weight = None
+        self._valid_total_weight = None
+        self._mutation_version += 1
+        self._ban_version += 1
+    
+    def _remove_card(self, idx):
+        name = self.names[idx]
+        self._total_weight = None
+        self._valid_total_weight = None
+        del self.names[idx]
+        del self.weights[idx]
+        del self.tags[idx]
+        del self._tags_str[idx]
+        
+        # 被删位置之后的卡牌下标前移一位, 同名卡牌始终指向首个出现的位置
+        del self._name_to_idx[name]
+        for i in range(idx, len(self.names)):
+            other = self.names[i]
+            if self._name_to_idx.get(other, i + 1) > i:
+                self._name_to_idx[other] = i
+        for tag_idxs in self._tag_index.values():
+            tag_idxs[:] = [i if i < idx else i - 1 for i in tag_idxs if i != idx]
+        self._mutation_version += 1
+        self._ban_version += 1
+    
+    def _set_weight(self, idx, weight):
+        self.weights[idx] = weight
+        self._total_weight = None
+        self._valid_total_weight = None
+        self._mutation_version += 1
+    
     def _get_total_weight(self, include_banned=False):
+        # 不做增量加减, 始终是按顺序求和的结果, 调用方对 0 的精确比较才可靠
         if include_banned:
-            return sum(card['weight'] for card in self.cards)
-        
-        total = 0.0
-        for card in self.cards:
-            if not self._is_card_banned(card):
-                total += card['weight']
-        return total
-    
-    def _is_card_banned(self, card):
-        for tag in card['tags']:
-            if self.ban_status.get(tag, False):
-                return True
-        return False
+            if self._total_weight is None:
+                self._total_weight = sum(self.weights)
+            return self._total_weight
+        valid = self._valid_mask()
+        if self._valid_total_weight is None:
+            self._valid_total_weight = sum(compress(self.weights, valid))
+        return self._valid_total_weight
+    
+    def _recompute_ban_mask(self):
+        self._ensure_bans_loaded()
+        banned_tags = self._banned_tags
+        if banned_tags:
+            self._banned = [not tags.isdisjoint(banned_tags) for tags in self.tags]
+        else:
+            self._banned = [False] * len(self.tags)
+        self._valid = [not banned for banned in self._banned]
+        self._valid_total_weight = None
+        self._banned_version = self._ban_version
+    
+    def _ban_mask(self):
+        if self._banned_version != self._ban_version:
+            self._recompute_ban_mask()
+        return self._banned
+    
+    def _valid_mask(self):
+        if self._banned_version != self._ban_version:
+            self._recompute_ban_mask()
+        return self._valid
     
     def _find_card(self, name):
-        for i, card in enumerate(self.cards):
-            if card['name'] == name:
-                return i, card
-        return -1, None
+        return self._name_to_idx.get(name, -1)
     
     def add_card(self, name, weight):
+        self._ensure_cards_loaded()
         weight = max(0.0, float(weight))
-        idx, card = self._find_card(name)
+        idx = self._find_card(name)
         
         if idx >= 0:
-            card['weight'] = weight
+            self._set_weight(idx, weight)
+            self._dirty = True
         else:
-            self.cards.append({'name': name, 'weight': weight, 'tags': set()})
+            self._append_card(name, weight, frozenset())
+            self._append_data([name, str(weight)])
         
-        self._save_data()
         return self._get_normalized_probability(name)
     
     def _get_normalized_probability(self, name):
         total = self._get_total_weight(include_banned=False)
-        _, card = self._find_card(name)
+        idx = self._find_card(name)
         
-        if card is None or self._is_card_banned(card):
+        if idx < 0 or self._ban_mask()[idx]:
             return 0.0
         
         if total == 0:
             return 0.0
             
-        return (card['weight'] / total) * 100
+        return (self.weights[idx] / total) * 100
     
     def list_cards(self):
+        self._ensure_cards_loaded()
         total_valid = self._get_total_weight(include_banned=False)
         
-        valid_cards = []
-        banned_cards = []
-        
-        for card in self.cards:
-            banned = self._is_card_banned(card)
-            tags = ', '.join(sorted(card['tags'])) if card['tags'] else '无'
-            
-            if banned:
-                prob = 0.0
-                banned_cards.append({
-                    'name': card['name'] + " [BANNED]",
-                    'weight': card['weight'],
-                    'probability': prob,
-                    'tags': tags
-                })
-            else:
-                prob = (card['weight'] / total_valid * 100) if total_valid > 0 else 0.0
-                valid_cards.append({
-                    'name': card['name'],
-                    'weight': card['weight'],
-                    'probability': prob,
-                    'tags': tags
-                })
+        valid = self._valid_mask()
+        banned = self._ban_mask()
         
-        valid_cards.sort(key=lambda x: x['probability'], reverse=True)
-        banned_cards.sort(key=lambda x: x['weight'], reverse=True)
+        # 按屏蔽状态整列划分后直接 zip 成 CardRow, 行对象只在这里构造一次
+        valid_weights = list(compress(self.weights, valid))
+        if total_valid > 0:
+            probs = [weight / total_valid * 100 for weight in valid_weights]
+        else:
+            probs = [0.0] * len(valid_weights)
+        valid_cards = list(map(CardRow._make, zip(
+            compress(self.names, valid), valid_weights, probs, compress(self._tags_str, valid)
+        )))
+        banned_cards = list(map(CardRow._make, zip(
+            [name + " [BANNED]" for name in compress(self.names, banned)],
+            compress(self.weights, banned), repeat(0.0), compress(self._tags_str, banned)
+        )))
+        
+        valid_cards.sort(key=itemgetter(2), reverse=True)
+        banned_cards.sort(key=itemgetter(1), reverse=True)
         
         return valid_cards + banned_cards
     
     def tag_card(self, name, tag):
-        idx, card = self._find_card(name)
+        self._ensure_cards_loaded()
+        idx = self._find_card(name)
         if idx < 0:
             return False
-        card['tags'].add(tag)
-        self._save_data()
+        tag = sys.intern(tag)
+        if tag not in self.tags[idx]:
+            self.tags[idx] = self.tags[idx] | {tag}
+            self._tags_str[idx] = _format_tags(self.tags[idx])
+            insort(self._tag_index.setdefault(tag, []), idx)
+            self._ban_version += 1
+            self._dirty = True
         return True
     
     def set_normalized_probability(self, name, target_prob):
+        self._ensure_cards_loaded()
         target_prob = float(target_prob)
-        idx, card = self._find_card(name)
+        idx = self._find_card(name)
         if idx < 0:
             return False
         
         if target_prob == 0:
-            del self.cards[idx]
-            self._save_data()
+            self._remove_card(idx)
+            self._dirty = True
             return True
         
         total = self._get_total_weight(include_banned=True)
-        others_weight = total - card['weight']
+        others_weight = total - self.weights[idx]
         
         if others_weight == 0:
-            card['weight'] = 1.0
+            self._set_weight(idx, 1.0)
         else:
             new_weight = (target_prob * others_weight) / (100.0 - target_prob)
-            card['weight'] = max(0.0, new_weight)
+            self._set_weight(idx, max(0.0, new_weight))
         
-        self._save_data()
+        self._dirty = True
         return True
     
     def adjust_tag_probability(self, tag, target_prob):
+        self._ensure_cards_loaded()
         target_prob = float(target_prob)
-        tag_cards = [card for card in self.cards if tag in card['tags']]
-        other_cards = [card for card in self.cards if tag not in card['tags']]
+        tag_idxs = self._tag_index.get(tag)
         
-        if not tag_cards:
+        if not tag_idxs:
             return False
         
-        tag_weight = sum(card['weight'] for card in tag_cards)
-        other_weight = sum(card['weight'] for card in other_cards)
+        tag_weight = sum(self.weights[i] for i in tag_idxs)
+        # 其余卡牌直接按顺序求和, 不用总权重相减, 避免相消误差破坏下面对 0 的判断
+        others = [True] * len(self.names)
+        for i in tag_idxs:
+            others[i] = False
+        other_weight = sum(compress(self.weights, others))
         
         if target_prob == 0:
-            for card in tag_cards:
-                card['weight'] = 0.0
+            for i in tag_idxs:
+                self._set_weight(i, 0.0)
         elif target_prob == 100:
             if other_weight > 0:
                 return False
@@ -178,52 +351,59 @@ class CardManager:
             if tag_weight == 0:
                 return False
             k = (target_prob * other_weight) / (tag_weight * (100.0 - target_prob))
-            for card in tag_cards:
-                card['weight'] *= k
+            for i in tag_idxs:
+                self._set_weight(i, self.weights[i] * k)
         
-        self._save_data()
+        self._dirty = True
         return True
     
+    def _sampling_table(self):
+        """未屏蔽卡牌的名称与累积权重"""
+        # 先取屏蔽掩码: 首次调用会加载 ban_status.csv 并递增 _ban_version
+        valid = self._valid_mask()
+        key = (self._ban_version, self._mutation_version)
+        if self._cdf_cache is None or self._cdf_cache[0] != key:
+            names = tuple(compress(self.names, valid))
+            cum = list(accumulate(compress(self.weights, valid)))
+            self._cdf_cache = (key, names, cum)
+        return self._cdf_cache[1], self._cdf_cache[2]
+    
     def pick_card(self, count=1):
-        valid_cards = []
-        weights = []
-        for card in self.cards:
-            if not self._is_card_banned(card):
-                valid_cards.append(card)
-                weights.append(card['weight'])
-        
-        total = sum(weights)
-        if total <= 0:
+        self._ensure_cards_loaded()
+        names, cum = self._sampling_table()
+        if not cum or cum[-1] <= 0:
             return None
         
-        # 确保每次抽取都是独立的
-        results = []
-        for _ in range(count):
-            chosen = random.choices(valid_cards, weights=weights, k=1)[0]
-            results.append(chosen['name'])
-        
         if count == 1:
-            return results[0]
-        else:
-            return results
+            # 单次抽取直接二分, 省去 choices 的调用与列表打包开销
+            return names[bisect(cum, random() * cum[-1], 0, len(cum) - 1)]
+        
+        # 一次调用完成全部抽取, 共用同一份累积权重; 每次抽取仍相互独立
+        return choices(names, cum_weights=cum, k=count)
     
     def delete_card(self, name):
         """删除指定卡牌"""
-        idx, card = self._find_card(name)
+        self._ensure_cards_loaded()
+        idx = self._find_card(name)
         if idx < 0:
             return False
         
-        del self.cards[idx]
-        self._save_data()
+        self._remove_card(idx)
+        self._dirty = True
         return True
     
     def test_randomness(self, card_name, trials=10000):
         """测试特定卡牌的出现频率"""
+        self._ensure_cards_loaded()
+        names, cum = self._sampling_table()
+        
+        # 直接在累积权重上批量逆 CDF 抽样, 不再逐次调用 pick_card
         count = 0
-        for _ in range(trials):
-            result = self.pick_card()
-            if result == card_name:
-                count += 1
+        if cum and cum[-1] > 0:
+            # 分批抽样, 大量试验时也不必分配 trials 长度的结果列表
+            for start in range(0, trials, TEST_BATCH_SIZE):
+                batch = min(TEST_BATCH_SIZE, trials - start)
+                count += choices(names, cum_weights=cum, k=batch).count(card_name)
         
         probability = count / trials * 100
         expected = self._get_normalized_probability(card_name)
@@ -238,11 +418,142 @@ class CardManager:
         if status not in ['0', '1']:
             return False
         
+        self._ensure_bans_loaded()
         banned = (status == '1')
+        tag = sys.intern(tag)
         self.ban_status[tag] = banned
+        if banned:
+            self._banned_tags.add(tag)
+        else:
+            self._banned_tags.discard(tag)
+        self._ban_version += 1
         self._save_ban_status()
         return True
 
+def _do_pick(manager, argv):
+    count = 1
+    
+    if len(argv) >= 3:
+        try:
+            count = int(argv[2])
+            if count < 1:
+                print("错误: 抽取次数必须大于0")
+                return
+        except ValueError:
+            print("错误: 无效的抽取次数")
+            return
+    
+    if count == 1:
+        card = manager.pick_card(count)
+        print(f"抽到了: {card}" if card else "卡池为空!")
+    else:
+        results = manager.pick_card(count)
+        if not results:
+            print("卡池为空!")
+            return
+        
+        print(f"抽取 {count} 次结果:")
+        for i, card in enumerate(results, 1):
+            print(f"{i}. {card}")
+
+def _do_add(manager, argv):
+    if len(argv) < 3:
+        print("缺少参数，格式: --add 名称|权重")
+        return
+    name, weight = argv[2].split('|', 1)
+    prob = manager.add_card(name, weight)
+    manager.flush()
+    print(f"卡牌 '{name}' 添加成功! 当前概率: {prob:.2f}%")
+
+def _do_delete(manager, argv):
+    if len(argv) < 3:
+        print("缺少参数，格式: --delete 名称")
+        return
+    name = argv[2]
+    if manager.delete_card(name):
+        manager.flush()
+        print(f"卡牌 '{name}' 已成功删除")
+    else:
+        print(f"错误: 卡牌 '{name}' 不存在")
+
+def _do_list(manager, argv):
+    cards = manager.list_cards()
+    if not cards:
+        print("卡池为空")
+        return
+    
+    print(f"{'名称':<25} {'权重':<10} {'概率(%)':<10} {'标签':<20}")
+    print("-" * 70)
+    
+    for card in cards:
+        print(f"{card.name:<25} {card.weight:<10.2f} {card.probability:<10.2f} {card.tags}")
+
+def _do_tag(manager, argv):
+    if len(argv) < 3:
+        print("缺少参数，格式: --tag 卡名|标签")
+        return
+    name, tag = argv[2].split('|', 1)
+    if manager.tag_card(name, tag):
+        manager.flush()
+        print(f"已为 '{name}' 添加标签 '{tag}'")
+    else:
+        print(f"错误: 卡牌 '{name}' 不存在")
+
+def _do_set(manager, argv):
+    if len(argv) < 3:
+        print("缺少参数，格式: --set 卡名|概率")
+        return
+    name, prob = argv[2].split('|', 1)
+    if manager.set_normalized_probability(name, prob):
+        manager.flush()
+        print(f"已更新 '{name}' 的概率")
+    else:
+        print(f"错误: 卡牌 '{name}' 不存在")
+
+def _do_tag_adjust(manager, argv):
+    if len(argv) < 3:
+        print("缺少参数，格式: --tag-adjust 标签|概率")
+        return
+    tag, prob = argv[2].split('|', 1)
+    if manager.adjust_tag_probability(tag, prob):
+        manager.flush()
+        print(f"标签 '{tag}' 的概率已调整为 {prob}%")
+    else:
+        print(f"错误: 调整失败 (标签不存在或无效参数)")
+
+def _do_ban_tag(manager, argv):
+    if len(argv) < 3:
+        print("缺少参数，格式: --ban-tag 标签|状态")
+        return
+    tag, status = argv[2].split('|', 1)
+    if manager.ban_tag(tag, status):
+        action = "屏蔽" if status == '1' else "取消屏蔽"
+        print(f"已{action}标签 '{tag}'")
+    else:
+        print(f"错误: 无效的状态值 '{status}' (应为0或1)")
+
+def _do_test(manager, argv):
+    if len(argv) < 3:
+        print("格式: --test 卡名|测试次数")
+        return
+    card_name, trials = argv[2].split('|', 1)
+    manager.test_randomness(card_name, int(trials))
+
+def _unknown(manager, argv):
+    print("未知命令")
+
+DISPATCH = {
+    '-p': _do_pick, '--pick': _do_pick,
+    '-a': _do_add, '--add': _do_add,
+    '-d': _do_delete, '--delete': _do_delete,
+    '-l': _do_list, '--list': _do_list,
+    '-t': _do_tag, '--tag': _do_tag,
+    '-s': _do_set, '--set': _do_set,
+    '--tag-adjust': _do_tag_adjust,
+    '--ban-tag': _do_ban_tag,
+    '--test': _do_test,
+}
+
 def main():
     if len(sys.argv) < 2:
         print("请使用以下命令:")
@@ -258,116 +569,10 @@ def main():
         return
     
     manager = CardManager()
-    command = sys.argv[1]
+    atexit.unregister(manager.flush)
     
     try:
-        if command in ['-p', '--pick']:
-            count = 1
-            
-            if len(sys.argv) >= 3:
-                try:
-                    count = int(sys.argv[2])
-                    if count < 1:
-                        print("错误: 抽取次数必须大于0")
-                        return
-                except ValueError:
-                    print("错误: 无效的抽取次数")
-                    return
-            
-            if count == 1:
-                card = manager.pick_card(count)
-                print(f"抽到了: {card}" if card else "卡池为空!")
-            else:
-                results = manager.pick_card(count)
-                if not results:
-                    print("卡池为空!")
-                    return
-                
-                print(f"抽取 {count} 次结果:")
-                for i, card in enumerate(results, 1):
-                    print(f"{i}. {card}")
-        
-        elif command in ['-a', '--add']:
-            if len(sys.argv) < 3:
-                print("缺少参数，格式: --add 名称|权重")
-                return
-            name, weight = sys.argv[2].split('|', 1)
-            prob = manager.add_card(name, weight)
-            print(f"卡牌 '{name}' 添加成功! 当前概率: {prob:.2f}%")
-        
-        elif command in ['-d', '--delete']:
-            if len(sys.argv) < 3:
-                print("缺少参数，格式: --delete 名称")
-                return
-            name = sys.argv[2]
-            if manager.delete_card(name):
-                print(f"卡牌 '{name}' 已成功删除")
-            else:
-                print(f"错误: 卡牌 '{name}' 不存在")
-        
-        elif command in ['-l', '--list']:
-            cards = manager.list_cards()
-            if not cards:
-                print("卡池为空")
-                return
-            
-            print(f"{'名称':<25} {'权重':<10} {'概率(%)':<10} {'标签':<20}")
-            print("-" * 70)
-            
-            for card in cards:
-                print(f"{card['name']:<25} {card['weight']:<10.2f} {card['probability']:<10.2f} {card['tags']}")
-        
-        elif command in ['-t', '--tag']:
-            if len(sys.argv) < 3:
-                print("缺少参数，格式: --tag 卡名|标签")
-                return
-            name, tag = sys.argv[2].split('|', 1)
-            if manager.tag_card(name, tag):
-                print(f"已为 '{name}' 添加标签 '{tag}'")
-            else:
-                print(f"错误: 卡牌 '{name}' 不存在")
-        
-        elif command in ['-s', '--set']:
-            if len(sys.argv) < 3:
-                print("缺少参数，格式: --set 卡名|概率")
-                return
-            name, prob = sys.argv[2].split('|', 1)
-            if manager.set_normalized_probability(name, prob):
-                print(f"已更新 '{name}' 的概率")
-            else:
-                print(f"错误: 卡牌 '{name}' 不存在")
-        
-        elif command == '--tag-adjust':
-            if len(sys.argv) < 3:
-                print("缺少参数，格式: --tag-adjust 标签|概率")
-                return
-            tag, prob = sys.argv[2].split('|', 1)
-            if manager.adjust_tag_probability(tag, prob):
-                print(f"标签 '{tag}' 的概率已调整为 {prob}%")
-            else:
-                print(f"错误: 调整失败 (标签不存在或无效参数)")
-        
-        elif command == '--ban-tag':
-            if len(sys.argv) < 3:
-                print("缺少参数，格式: --ban-tag 标签|状态")
-                return
-            tag, status = sys.argv[2].split('|', 1)
-            if manager.ban_tag(tag, status):
-                action = "屏蔽" if status == '1' else "取消屏蔽"
-                print(f"已{action}标签 '{tag}'")
-            else:
-                print(f"错误: 无效的状态值 '{status}' (应为0或1)")
-        
-        elif command == '--test':
-            if len(sys.argv) < 3:
-                print("格式: --test 卡名|测试次数")
-                return
-            card_name, trials = sys.argv[2].split('|', 1)
-            manager.test_randomness(card_name, int(trials))
-        
-        else:
-            print("未知命令")
-    
+        DISPATCH.get(sys.argv[1], _unknown)(manager, sys.argv)
     except Exception as e:
         print(f"操作失败: {str(e)}")
 